@@ -0,0 +1,124 @@
+"""
+Module for caching embeddings on disk.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_CACHE_PATH = 'data/cache/embeddings'
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    An embedding model proxy that stores every embedding on disk and only
+    calls the underlying model for texts it has never seen.
+
+    Embeddings are saved as one float32 .npy file per text, named after the
+    SHA-256 of the text, under a directory per embedding model.
+
+    Parameters
+    ----------
+    underlying : Embeddings
+        Embedding model used for texts missing from the cache
+    cache_path : str, optional
+        Directory where the embeddings are persisted, by default 'data/cache/embeddings'
+    namespace : str, optional
+        Subdirectory separating the embeddings of different models, by default
+        the model name of the underlying embedder
+
+    Attributes
+    ----------
+    underlying : Embeddings
+        Embedding model used for texts missing from the cache
+    cache_path : Path
+        Pathlib Path object for the directory holding this model's embeddings
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        namespace: Optional[str] = None
+    ):
+        self.underlying = underlying
+        if namespace is None:
+            namespace = getattr(underlying, 'model', type(underlying).__name__)
+        self.cache_path = Path(cache_path) / namespace
+
+    def _filepath(self, text: str) -> Path:
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return self.cache_path / f"{key}.npy"
+
+    def _load(self, text: str) -> Optional[List[float]]:
+        filepath = self._filepath(text)
+        if not filepath.exists():
+            return None
+        return np.load(filepath).tolist()
+
+    def _save(self, text: str, embedding: List[float]) -> None:
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and move it into place, so an interrupted or
+        # concurrent write never leaves a truncated .npy behind
+        fd, temp_filepath = tempfile.mkstemp(dir=self.cache_path, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.save(file, np.asarray(embedding, dtype=np.float32))
+            os.replace(temp_filepath, self._filepath(text))
+        except BaseException:
+            os.unlink(temp_filepath)
+            raise
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts, calling the underlying model once for all the
+        texts missing from the cache.
+
+        Parameters
+        ----------
+        texts : List[str]
+            Texts to embed
+
+        Returns
+        -------
+        List[List[float]]
+            Embedding of each text, in the same order
+        """
+        embeddings: Dict[str, List[float]] = {}
+        for text in texts:
+            cached = self._load(text)
+            if cached is not None:
+                embeddings[text] = cached
+
+        uncached_texts = list(dict.fromkeys(text for text in texts if text not in embeddings))
+        if uncached_texts:
+            for text, embedding in zip(uncached_texts, self.underlying.embed_documents(uncached_texts)):
+                self._save(text, embedding)
+                embeddings[text] = embedding
+
+        return [embeddings[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single text, calling the underlying model only on a cache miss.
+
+        Parameters
+        ----------
+        text : str
+            Text to embed
+
+        Returns
+        -------
+        List[float]
+            Embedding of the text
+        """
+        embedding = self._load(text)
+        if embedding is None:
+            embedding = self.underlying.embed_query(text)
+            self._save(text, embedding)
+        return embedding
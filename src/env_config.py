@@ -2,6 +2,8 @@
 Module for managing environment configurations.
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from pydantic.types import SecretStr
 
@@ -14,6 +16,9 @@ class Settings(BaseSettings):
     # API keys and endpoints
     openai_api_key: SecretStr = "xxx"
 
+    # Set LLM_CACHE_DISABLE=1 to bypass the LLM response caches, e.g. for benchmarking
+    llm_cache_disable: bool = False
+
     class Config:
         # File path for environment file
         env_file = '.env'
@@ -21,5 +26,9 @@ class Settings(BaseSettings):
         #secrets_dir = 'run/secrets'
 
 
-# Creating an instance of Settings
-env = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_env() -> Settings:
+    """
+    Returns the Settings instance, created on first use.
+    """
+    return Settings()
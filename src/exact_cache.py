@@ -0,0 +1,70 @@
+"""
+Module for caching LLM responses by an exact hash of the request.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = 'data/cache/llm'
+
+
+def get_cache_key(model_name: str, prompt: str, temperature: float, max_tokens: int, extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key of an LLM request.
+
+    Args:
+    - model_name (str): The name of the language model.
+    - prompt (str): The fully rendered prompt.
+    - temperature (float): The temperature of the request.
+    - max_tokens (int): The maximum number of tokens of the request.
+    - extra (dict, optional): Any other setting that shapes the response. Defaults to None.
+
+    Returns:
+    - str: The SHA-256 hex digest identifying the request.
+    """
+    request = {
+        "model": model_name,
+        "prompt": prompt,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if extra is not None:
+        request["extra"] = extra
+
+    payload = json.dumps(request, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_cached_response(key: str, cache_path: str = DEFAULT_CACHE_PATH) -> Optional[str]:
+    """
+    Returns the cached response for a key, or None if it was never stored.
+    """
+    filepath = Path(cache_path) / f"{key}.txt"
+    if not filepath.exists():
+        return None
+
+    with open(filepath, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def put_cached_response(key: str, response: str, cache_path: str = DEFAULT_CACHE_PATH) -> None:
+    """
+    Stores the response for a key.
+    """
+    filepath = Path(cache_path) / f"{key}.txt"
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file and move it into place, so an interrupted write
+    # never leaves a truncated response to be served as a hit
+    fd, temp_filepath = tempfile.mkstemp(dir=filepath.parent, suffix='.txt.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(response)
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        os.unlink(temp_filepath)
+        raise
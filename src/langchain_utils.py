@@ -1,14 +1,20 @@
+from __future__ import annotations
+
 import os
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import OpenAIEmbeddings, AzureChatOpenAI, AzureOpenAIEmbeddings, ChatOpenAI
+from typing import TYPE_CHECKING, Optional
+
+from src.env_config import get_env
 
-from src.env_config import env
+# Provider packages are heavy to import, so each factory imports its own on first call
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_openai import OpenAIEmbeddings, AzureChatOpenAI, ChatOpenAI
 
 # ---------------------
 # Models
 # ---------------------
 
-def get_llm_openai(model_name: str, temperature: float = 0.7, max_tokens: int = 256, request_timeout: int = 60) -> ChatOpenAI:
+def get_llm_openai(model_name: str, temperature: float = 0.7, max_tokens: int = 256, request_timeout: int = 60, cache: Optional[bool] = None) -> ChatOpenAI:
     """
     This function creates and returns a language model instance based on the specified model name.
 
@@ -17,6 +23,7 @@ def get_llm_openai(model_name: str, temperature: float = 0.7, max_tokens: int =
         temperature (float, optional): The temperature for the language model. Defaults to 0.7.
         max_tokens (int, optional): The maximum number of tokens for the language model. Defaults to 256.
         request_timeout (int, optional): The request timeout for the language model. Defaults to 60.
+        cache (bool, optional): Whether to use the global LLM cache, False to bypass it. Defaults to None, which uses it when one is set.
 
     Returns:
         Union[ChatOpenAI, OpenAI]: An instance of either ChatOpenAI or OpenAI based on the model name.
@@ -24,12 +31,14 @@ def get_llm_openai(model_name: str, temperature: float = 0.7, max_tokens: int =
     Raises:
         ValueError: If the model name is not supported.
     """
+    from langchain_openai import ChatOpenAI
 
     return ChatOpenAI(
         temperature=temperature,
         model_name=model_name,
         max_tokens=max_tokens,
-        openai_api_key=env.openai_api_key.get_secret_value()
+        openai_api_key=get_env().openai_api_key.get_secret_value(),
+        cache=cache
     )
 
 def get_llm_azure(model_name: str, temperature: float = 0.7, max_tokens: int = 256, request_timeout: int = 60) -> AzureChatOpenAI:
@@ -49,6 +58,8 @@ def get_llm_azure(model_name: str, temperature: float = 0.7, max_tokens: int = 2
         ValueError: If the model name is not supported.
     """
 
+    from langchain_openai import AzureChatOpenAI
+
     api_version = "2023-12-01-preview"
 
     model_classes = {
@@ -67,9 +78,9 @@ def get_llm_azure(model_name: str, temperature: float = 0.7, max_tokens: int = 2
         api_version=api_version,
         temperature=temperature,
         max_tokens=max_tokens,
-        openai_api_type=env.azure_openai_api_type.get_secret_value(),
-        azure_endpoint=env.azure_openai_api_base.get_secret_value(),
-        api_key=env.azure_openai_api_key.get_secret_value()
+        openai_api_type=get_env().azure_openai_api_type.get_secret_value(),
+        azure_endpoint=get_env().azure_openai_api_base.get_secret_value(),
+        api_key=get_env().azure_openai_api_key.get_secret_value()
     )
 
     return llm
@@ -84,6 +95,8 @@ def get_llm_anthropic(model_name: str, temperature: float = 0.7, max_tokens: int
         max_tokens (int, optional): The maximum number of tokens for the language model. Defaults to 256.
 
     """
+    from langchain_anthropic import ChatAnthropic
+
     models = ['claude-3-opus-20240229', 'claude-3-sonnet-20240229', 'claude-3-haiku-20240307']
     if model_name not in models:
         model_name = 'claude-3-opus-20240229'
@@ -92,7 +105,7 @@ def get_llm_anthropic(model_name: str, temperature: float = 0.7, max_tokens: int
     return ChatAnthropic(
         model=model_name,
         temperature=temperature,
-        anthropic_api_key=env.anthropic_api_key.get_secret_value(),
+        anthropic_api_key=get_env().anthropic_api_key.get_secret_value(),
         max_tokens=max_tokens,
     )
 
@@ -102,9 +115,10 @@ def get_llm_anthropic(model_name: str, temperature: float = 0.7, max_tokens: int
 
 def get_embedder() -> OpenAIEmbeddings:
     """Get the OpenAIEmbeddings instance."""
+    from langchain_openai import OpenAIEmbeddings
 
     embeddings = OpenAIEmbeddings(
-        openai_api_key=env.openai_api_key.get_secret_value(),
+        openai_api_key=get_env().openai_api_key.get_secret_value(),
         model="text-embedding-ada-002"
     )
 
@@ -0,0 +1,173 @@
+"""
+Module for caching LLM responses by semantic similarity of the prompt.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.embedding_cache import CachedEmbeddings
+from src.langchain_utils import get_embedder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'data/cache/semantic'
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class SemanticCache:
+    """
+    A cache that returns a stored LLM response when a new prompt is close enough
+    to a previously answered one.
+
+    Prompts are embedded with the project embedder and compared by cosine
+    similarity. Entries are persisted as JSON so the cache survives reruns, and
+    expire after a fixed time to live.
+
+    Parameters
+    ----------
+    cache_path : str, optional
+        Directory where the cache entries are persisted, by default 'data/cache/semantic'
+    embedder : Embeddings, optional
+        Embedding model used to vectorize prompts, by default the one from get_embedder()
+        behind a disk cache, so repeated probes with the same prompt are not re-embedded
+    similarity_threshold : float, optional
+        Minimum cosine similarity for a stored prompt to count as a hit, by default 0.95
+    ttl_seconds : int, optional
+        Time to live of each entry in seconds, by default 24 hours
+
+    Attributes
+    ----------
+    cache_file : Path
+        Pathlib Path object for the JSON file holding the entries
+    embedder : Embeddings
+        Embedding model used to vectorize prompts
+    similarity_threshold : float
+        Minimum cosine similarity for a hit
+    ttl_seconds : int
+        Time to live of each entry in seconds
+    """
+
+    def __init__(
+        self,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        embedder: Optional[Embeddings] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS
+    ):
+        self.cache_file = Path(cache_path) / 'entries.json'
+        self.embedder = embedder or CachedEmbeddings(get_embedder())
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        # Entries are shared by the concurrent recaps, each looking them up from a worker thread
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """Load the non-expired entries from disk, starting empty if the file is unreadable."""
+        if not self.cache_file.exists():
+            return []
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                entries = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable semantic cache {self.cache_file}: {e}")
+            return []
+
+        return [entry for entry in entries if not self._is_expired(entry)]
+
+    def _save(self) -> None:
+        """Persist the current entries to disk."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and move it into place, so an interrupted write
+        # never leaves truncated JSON behind
+        fd, temp_filepath = tempfile.mkstemp(dir=self.cache_file.parent, suffix='.json.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(self._entries, file)
+            os.replace(temp_filepath, self.cache_file)
+        except BaseException:
+            os.unlink(temp_filepath)
+            raise
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['created_at'] > self.ttl_seconds
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed a text and normalize it so a dot product is the cosine similarity."""
+        vector = np.asarray(self.embedder.embed_query(text), dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def get(self, prompt_text: str, namespace: str) -> Optional[str]:
+        """
+        Look up the response of a semantically similar prompt.
+
+        Only entries stored under the same namespace are compared, so prompts
+        built from different models or templates never answer for each other.
+
+        Parameters
+        ----------
+        prompt_text : str
+            Fully rendered prompt
+        namespace : str
+            Identifier of the model and prompt template that produce the response
+
+        Returns
+        -------
+        Optional[str]
+            The cached response on a hit, None otherwise
+        """
+        with self._lock:
+            candidates = [
+                entry for entry in self._entries
+                if entry.get('namespace') == namespace and not self._is_expired(entry)
+            ]
+        if not candidates:
+            return None
+
+        embeddings = np.asarray([entry['embedding'] for entry in candidates], dtype=np.float32)
+        scores = embeddings @ self._embed(prompt_text)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        return candidates[best]['response']
+
+    def put(self, prompt_text: str, namespace: str, response: str) -> None:
+        """
+        Store the response of a prompt.
+
+        Parameters
+        ----------
+        prompt_text : str
+            Fully rendered prompt
+        namespace : str
+            Identifier of the model and prompt template that produced the response
+        response : str
+            Response returned by the LLM for that prompt
+        """
+        entry = {
+            'namespace': namespace,
+            'embedding': self._embed(prompt_text).tolist(),
+            'response': response,
+            'created_at': time.time(),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self._save()
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries = []
+            self._save()
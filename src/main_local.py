@@ -1,4 +1,5 @@
-import whisper
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 import os
 
 
@@ -12,11 +13,30 @@ INPUT_FILEPATH = os.path.join(INPUT_PATH, INPUT_FILENAME)
 OUTPUT_FILENAME = os.path.splitext(INPUT_FILENAME)[0] + ".txt"
 OUTPUT_FILEPATH = os.path.join(OUTPUT_PATH, OUTPUT_FILENAME)
 
+# Model settings, INT8 weights cut the memory traffic of decoding by 4x versus FP32
+MODEL_NAME = "large-v3"
+# Use the GPU whenever one is visible, falling back to the CPU otherwise
+DEVICE = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+COMPUTE_TYPE = "int8_float16" if DEVICE == "cuda" else "int8"
+BATCH_SIZE = 16
+# Greedy decoding, beam search multiplies decoder work for little gain on meetings
+BEAM_SIZE = 1
 
-model = whisper.load_model("large")
-result = model.transcribe(INPUT_FILEPATH)
 
-print(result["text"])
+model = WhisperModel(MODEL_NAME, device=DEVICE, compute_type=COMPUTE_TYPE)
+pipeline = BatchedInferencePipeline(model=model)
+
+# Keeping timestamps avoids the quality drop of the batched pipeline on 30-second segments
+segments, _ = pipeline.transcribe(
+    INPUT_FILEPATH,
+    batch_size=BATCH_SIZE,
+    beam_size=BEAM_SIZE,
+    vad_filter=True,
+    without_timestamps=False
+)
+text = " ".join(segment.text.strip() for segment in segments)
+
+print(text)
 
 with open(OUTPUT_FILEPATH, 'w') as file:
-    file.write(result["text"])
+    file.write(text)
@@ -1,13 +1,20 @@
+import asyncio
+import hashlib
+import io
+import json
 import os
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import subprocess
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
+import httpx
 from tqdm import tqdm
 from pydub import AudioSegment
-from openai import OpenAI
-from src.env_config import env
+from pydub.exceptions import CouldntDecodeError, CouldntEncodeError
+from pydub.silence import detect_nonsilent
+from openai import AsyncOpenAI
+from src.env_config import get_env
 
 # Configure logging
 logging.basicConfig(
@@ -16,12 +23,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+TRANSCRIPTION_MODEL = "whisper-1"
+
+# Whisper works on 16kHz mono audio, so anything above that is wasted upload
+SAMPLE_RATE = 16000
+UPLOAD_BITRATE = "24k"
+
+# Bytes of the input file hashed, along with its size, to identify it in the cache
+CACHE_KEY_HEAD_BYTES = 1024 * 1024
+
+# Silence detection settings
+SILENCE_PAD_MS = 1000
+SILENCE_THRESH_OFFSET_DB = 16
+SILENCE_SEEK_STEP_MS = 100
+# Chunks are cut in silences of at least this length, once they reach this share of the chunk length
+SPLIT_MIN_SILENCE_MS = 700
+CHUNK_FILL_RATIO = 0.9
+
+
+def to_original_ms(timestamp_map: List[Tuple[int, int]], compressed_ms: int) -> int:
+    """
+    Translate a position in silence-stripped audio back to the original audio.
+
+    Parameters
+    ----------
+    timestamp_map : List[Tuple[int, int]]
+        Start of each kept span as (compressed_ms, original_ms) pairs
+    compressed_ms : int
+        Position in the silence-stripped audio, in milliseconds
+
+    Returns
+    -------
+    int
+        Matching position in the original audio, in milliseconds
+    """
+    index = max(bisect_right([compressed for compressed, _ in timestamp_map], compressed_ms) - 1, 0)
+    compressed_start, original_start = timestamp_map[index]
+    return original_start + compressed_ms - compressed_start
+
+
 class AudioTranscriber:
     """
     A class for transcribing audio files using OpenAI's Whisper model.
 
     This class handles the process of loading audio files, splitting them into
     manageable chunks, and transcribing them in parallel using the Whisper API.
+    It holds a pool of HTTP connections, so use it as an async context manager
+    or call close() when done.
 
     Parameters
     ----------
@@ -30,9 +78,9 @@ class AudioTranscriber:
     output_path : str, optional
         Directory path for output transcription files, by default 'data/output'
     chunk_length_minutes : int, optional
-        Length of each audio chunk in minutes, by default 10
+        Maximum length of each audio chunk in minutes, by default 10
     max_workers : int, optional
-        Maximum number of concurrent workers for parallel processing, by default 3
+        Maximum number of chunks transcribed concurrently, by default 8
 
     Attributes
     ----------
@@ -40,12 +88,14 @@ class AudioTranscriber:
         Pathlib Path object for input directory
     output_path : Path
         Pathlib Path object for output directory
+    cache_path : Path
+        Pathlib Path object for the directory caching decoded audio and transcriptions
     chunk_length_ms : int
-        Length of each audio chunk in milliseconds
+        Maximum length of each audio chunk in milliseconds
     max_workers : int
-        Maximum number of concurrent workers
-    client : OpenAI
-        OpenAI client instance for API calls
+        Maximum number of chunks transcribed concurrently
+    client : AsyncOpenAI
+        Async OpenAI client instance for API calls, sharing one HTTP/2 connection pool
     """
 
     def __init__(
@@ -53,18 +103,40 @@ class AudioTranscriber:
         input_path: str = 'data/input',
         output_path: str = 'data/output',
         chunk_length_minutes: int = 10,
-        max_workers: int = 3
+        max_workers: int = 8
     ):
         self.input_path = Path(input_path)
         self.output_path = Path(output_path)
+        self.cache_path = self.input_path / '.cache'
         self.chunk_length_ms = chunk_length_minutes * 60 * 1000
         self.max_workers = max_workers
-        self.client = OpenAI(api_key=env.openai_api_key.get_secret_value())
+        # Keep connections alive across chunks so the TLS handshake is paid once per connection
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers),
+            timeout=120
+        )
+        self.client = AsyncOpenAI(
+            api_key=get_env().openai_api_key.get_secret_value(),
+            http_client=self._http_client
+        )
         
         # Ensure directories exist
         self.output_path.mkdir(parents=True, exist_ok=True)
         self.input_path.mkdir(parents=True, exist_ok=True)
 
+    async def __aenter__(self) -> "AudioTranscriber":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the HTTP connections held by the client.
+        """
+        await self._http_client.aclose()
+
     def validate_audio_file(self, filepath: Path) -> bool:
         """
         Validate if the audio file exists and is in a supported format.
@@ -95,14 +167,284 @@ class AudioTranscriber:
         
         return True
 
-    def process_chunk(self, chunk: AudioSegment, chunk_index: int) -> str:
+    def get_cache_key(self, filepath: Path) -> str:
         """
-        Process a single audio chunk and transcribe it.
+        Identify an input file for the cache without hashing all of it.
 
         Parameters
         ----------
-        chunk : AudioSegment
+        filepath : Path
+            Path to the audio file
+
+        Returns
+        -------
+        str
+            Hash of the first megabyte of the file and of its size
+        """
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            digest.update(file.read(CACHE_KEY_HEAD_BYTES))
+        digest.update(str(filepath.stat().st_size).encode())
+        return digest.hexdigest()[:16]
+
+    def get_transcription_cache_key(self, cache_key: str) -> str:
+        """
+        Identify the transcription of an input file for the cache.
+
+        Every setting that changes the transcription is hashed along with the
+        file key, so changing any of them produces a new transcription instead
+        of reusing a stale one.
+
+        Parameters
+        ----------
+        cache_key : str
+            Key of the file in the cache, as returned by get_cache_key
+
+        Returns
+        -------
+        str
+            Hash of the file key and of the transcription settings
+        """
+        settings = {
+            'audio': cache_key,
+            'model': TRANSCRIPTION_MODEL,
+            'sample_rate': SAMPLE_RATE,
+            'upload_bitrate': UPLOAD_BITRATE,
+            'chunk_length_ms': self.chunk_length_ms,
+            'chunk_fill_ratio': CHUNK_FILL_RATIO,
+            'split_min_silence_ms': SPLIT_MIN_SILENCE_MS,
+            'silence_pad_ms': SILENCE_PAD_MS,
+            'silence_thresh_offset_db': SILENCE_THRESH_OFFSET_DB,
+            'silence_seek_step_ms': SILENCE_SEEK_STEP_MS,
+        }
+        payload = json.dumps(settings, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def load_audio(self, filepath: Path, cache_key: Optional[str] = None) -> AudioSegment:
+        """
+        Decode an audio file to 16kHz mono 16-bit PCM.
+
+        ffmpeg downmixes and resamples while decoding, so the full-rate PCM of
+        the source is never held in memory nor resampled in Python. When a cache
+        key is given, the decoded PCM is cached as a .raw file with a JSON
+        sidecar, and later loads skip ffmpeg entirely.
+
+        Parameters
+        ----------
+        filepath : Path
+            Path to the audio file to decode
+        cache_key : str, optional
+            Key of the file in the cache, as returned by get_cache_key, by default None
+
+        Returns
+        -------
+        AudioSegment
+            Decoded audio
+
+        Raises
+        ------
+        CouldntDecodeError
+            If ffmpeg fails to decode the file
+        """
+        if cache_key is not None:
+            raw_filepath = self.cache_path / f"{cache_key}.raw"
+            metadata_filepath = self.cache_path / f"{cache_key}.json"
+            # The sidecar is written last, so its presence means the PCM is complete.
+            # If the PCM was removed since, decode the file again
+            if metadata_filepath.exists() and raw_filepath.exists():
+                with open(metadata_filepath, 'r', encoding='utf-8') as file:
+                    metadata = json.load(file)
+                return AudioSegment(
+                    data=raw_filepath.read_bytes(),
+                    sample_width=metadata['sample_width'],
+                    frame_rate=metadata['frame_rate'],
+                    channels=metadata['channels']
+                )
+
+        command = [
+            AudioSegment.converter, "-nostdin",
+            "-i", str(filepath),
+            "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-acodec", "pcm_s16le", "-f", "s16le", "-"
+        ]
+        result = subprocess.run(command, capture_output=True)
+        if result.returncode != 0:
+            raise CouldntDecodeError(
+                f"Decoding failed. ffmpeg returned error code: {result.returncode}\n\n"
+                f"{result.stderr.decode(errors='replace')}"
+            )
+
+        audio = AudioSegment(data=result.stdout, sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+
+        if cache_key is not None:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            raw_filepath.write_bytes(audio.raw_data)
+            with open(metadata_filepath, 'w', encoding='utf-8') as file:
+                json.dump(
+                    {
+                        'source': filepath.name,
+                        'sample_width': audio.sample_width,
+                        'frame_rate': audio.frame_rate,
+                        'channels': audio.channels,
+                    },
+                    file
+                )
+
+        return audio
+
+    def remove_silence(self, audio: AudioSegment) -> Tuple[AudioSegment, List[Tuple[int, int]]]:
+        """
+        Shorten every silence of the audio to a short pad.
+
+        Silences longer than SILENCE_PAD_MS are cut down to SILENCE_PAD_MS, half
+        of it kept on each side of the surrounding speech so word edges are not
+        clipped.
+
+        Parameters
+        ----------
+        audio : AudioSegment
             Audio segment to process
+
+        Returns
+        -------
+        Tuple[AudioSegment, List[Tuple[int, int]]]
+            The silence-stripped audio, and the start of each kept span as
+            (compressed_ms, original_ms) pairs
+        """
+        speech_intervals = detect_nonsilent(
+            audio,
+            min_silence_len=SILENCE_PAD_MS,
+            silence_thresh=audio.dBFS - SILENCE_THRESH_OFFSET_DB,
+            seek_step=SILENCE_SEEK_STEP_MS
+        )
+        if not speech_intervals:
+            return audio, [(0, 0)]
+
+        # Keep half a pad of the original silence around each speech span, merging overlaps
+        margin = SILENCE_PAD_MS // 2
+        spans: List[List[int]] = []
+        for start, end in speech_intervals:
+            start, end = max(start - margin, 0), min(end + margin, len(audio))
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+
+        timestamp_map: List[Tuple[int, int]] = []
+        compressed_ms = 0
+        for start, end in spans:
+            timestamp_map.append((compressed_ms, start))
+            compressed_ms += end - start
+
+        # Join the raw PCM once instead of concatenating segments pairwise
+        speech_audio = AudioSegment(
+            data=b"".join(audio[start:end].raw_data for start, end in spans),
+            sample_width=audio.sample_width,
+            frame_rate=audio.frame_rate,
+            channels=audio.channels
+        )
+        return speech_audio, timestamp_map
+
+    def find_chunk_boundaries(self, audio: AudioSegment) -> List[Tuple[int, int]]:
+        """
+        Choose chunk boundaries that fall inside silences.
+
+        A chunk is closed at the first silence found once it reaches
+        CHUNK_FILL_RATIO of the chunk length. If no silence shows up before the
+        chunk length, it is closed at the last silence seen, or cut at the
+        chunk length when there was none.
+
+        Parameters
+        ----------
+        audio : AudioSegment
+            Audio segment to split
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            Start and end of each chunk in milliseconds
+        """
+        speech_intervals = detect_nonsilent(
+            audio,
+            min_silence_len=SPLIT_MIN_SILENCE_MS,
+            silence_thresh=audio.dBFS - SILENCE_THRESH_OFFSET_DB,
+            seek_step=SILENCE_SEEK_STEP_MS
+        )
+        # Candidate cuts sit in the middle of each silence between speech spans
+        cut_points = [
+            (end + next_start) // 2
+            for (_, end), (next_start, _) in zip(speech_intervals, speech_intervals[1:])
+        ]
+
+        min_length_ms = int(self.chunk_length_ms * CHUNK_FILL_RATIO)
+        boundaries: List[Tuple[int, int]] = []
+        start = 0
+        last_cut: Optional[int] = None
+        for cut in cut_points + [len(audio)]:
+            while cut - start > self.chunk_length_ms:
+                end = last_cut if last_cut is not None else start + self.chunk_length_ms
+                boundaries.append((start, end))
+                start, last_cut = end, None
+
+            if cut - start >= min_length_ms:
+                boundaries.append((start, cut))
+                start, last_cut = cut, None
+            else:
+                last_cut = cut
+
+        if start < len(audio):
+            boundaries.append((start, len(audio)))
+
+        return boundaries
+
+    def encode_chunk(self, chunk: AudioSegment, chunk_index: int) -> io.BytesIO:
+        """
+        Encode a single audio chunk into an in-memory file ready for upload.
+
+        Parameters
+        ----------
+        chunk : AudioSegment
+            Audio segment to encode
+        chunk_index : int
+            Index of the chunk for identification
+
+        Returns
+        -------
+        io.BytesIO
+            Encoded audio, positioned at its start
+
+        Raises
+        ------
+        CouldntEncodeError
+            If ffmpeg fails to encode the chunk
+        """
+        # Low-bitrate Opus keeps Whisper's accuracy with a ~5x smaller upload than MP3 defaults.
+        # PCM is piped in and Ogg out, unlike AudioSegment.export which goes through temporary files
+        command = [
+            AudioSegment.converter, "-nostdin",
+            "-f", "s16le", "-ar", str(chunk.frame_rate), "-ac", str(chunk.channels), "-i", "pipe:0",
+            "-c:a", "libopus", "-b:a", UPLOAD_BITRATE, "-f", "ogg", "pipe:1"
+        ]
+        result = subprocess.run(command, input=chunk.raw_data, capture_output=True)
+        if result.returncode != 0:
+            raise CouldntEncodeError(
+                f"Encoding failed. ffmpeg returned error code: {result.returncode}\n\n"
+                f"{result.stderr.decode(errors='replace')}"
+            )
+
+        buffer = io.BytesIO(result.stdout)
+        # The API infers the audio format from the file name
+        buffer.name = f"chunk_{chunk_index}.ogg"
+        return buffer
+
+    async def process_chunk(self, audio_file: io.BytesIO, chunk_index: int) -> str:
+        """
+        Transcribe a single encoded audio chunk.
+
+        Parameters
+        ----------
+        audio_file : io.BytesIO
+            Encoded audio chunk, as returned by encode_chunk
         chunk_index : int
             Index of the chunk for identification
 
@@ -114,39 +456,30 @@ class AudioTranscriber:
         Raises
         ------
         Exception
-            If there's an error during processing or transcription
+            If there's an error during transcription
         """
-        temp_filename = f"temp_chunk_{chunk_index}_{int(time.time())}.mp3"
-        temp_filepath = self.output_path / temp_filename
-
         try:
-            # Export chunk to temporary file
-            chunk.export(temp_filepath, format="mp3")
-            
             # Transcribe the audio chunk
-            with open(temp_filepath, "rb") as audio_file:
-                result = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file
-                )
-                return result.text
+            result = await self.client.audio.transcriptions.create(
+                model=TRANSCRIPTION_MODEL,
+                file=audio_file
+            )
+            return result.text
 
         except Exception as e:
             logger.error(f"Error processing chunk {chunk_index}: {str(e)}")
             raise
-        finally:
-            # Cleanup temporary file
-            if temp_filepath.exists():
-                temp_filepath.unlink()
 
-    def transcribe_file(self, input_filename: str) -> Optional[str]:
+    async def transcribe_file(self, input_filename: str) -> Optional[str]:
         """
         Transcribe an audio file to text.
 
         This method handles the complete transcription process including:
         - Loading and validating the audio file
+        - Reusing a cached transcription or decoded audio of the same file
+        - Shortening long silences
         - Splitting it into chunks
-        - Processing chunks in parallel
+        - Encoding chunks while earlier ones are being transcribed
         - Combining results
         - Saving the final transcription
 
@@ -173,45 +506,81 @@ class AudioTranscriber:
             # Validate input file
             self.validate_audio_file(input_filepath)
             
+            # Reruns on the same file with the same settings reuse its transcription
+            cache_key = self.get_cache_key(input_filepath)
+            transcription_cache_key = self.get_transcription_cache_key(cache_key)
+            cached_transcription_filepath = self.cache_path / f"{transcription_cache_key}.txt"
+            if cached_transcription_filepath.exists():
+                with open(output_filepath, 'w', encoding='utf-8') as file:
+                    file.write(cached_transcription_filepath.read_text(encoding='utf-8'))
+                logger.info(f"Cached transcription saved to: {output_filepath}")
+                return str(output_filepath)
+
             # Load the audio file
             logger.info(f"Loading audio file: {input_filename}")
-            full_audio = AudioSegment.from_file(str(input_filepath))
+            full_audio = self.load_audio(input_filepath, cache_key)
+
+            # Drop long silences so they are neither uploaded nor transcribed
+            original_length_ms = len(full_audio)
+            full_audio, timestamp_map = self.remove_silence(full_audio)
+            logger.info(
+                f"Kept {len(timestamp_map)} speech spans, "
+                f"{len(full_audio) / 1000:.0f}s of {original_length_ms / 1000:.0f}s"
+            )
             
             # Calculate chunks
-            num_chunks = len(full_audio) // self.chunk_length_ms + (1 if len(full_audio) % self.chunk_length_ms > 0 else 0)
-            chunks = [
-                full_audio[i * self.chunk_length_ms:(i + 1) * self.chunk_length_ms]
-                for i in range(num_chunks)
-            ]
-            
-            # Process chunks in parallel
-            transcriptions: List[str] = []
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_chunk = {
-                    executor.submit(self.process_chunk, chunk, i): i
-                    for i, chunk in enumerate(chunks)
-                }
-                
-                # Process results as they complete
-                with tqdm(total=len(chunks), desc="Transcribing") as pbar:
-                    for future in as_completed(future_to_chunk):
-                        chunk_idx = future_to_chunk[future]
-                        try:
-                            transcription = future.result()
-                            transcriptions.append((chunk_idx, transcription))
-                            pbar.update(1)
-                        except Exception as e:
-                            logger.error(f"Chunk {chunk_idx} failed: {str(e)}")
-                            raise
-
-            # Sort transcriptions by chunk index and combine
-            transcriptions.sort(key=lambda x: x[0])
-            full_transcription = "\n".join(text for _, text in transcriptions)
+            boundaries = self.find_chunk_boundaries(full_audio)
+            # Report chunks in the time of the source recording, not of the silence-stripped audio
+            for i, (start, end) in enumerate(boundaries):
+                logger.info(
+                    f"Chunk {i}: {to_original_ms(timestamp_map, start) / 1000:.1f}s"
+                    f" to {to_original_ms(timestamp_map, end) / 1000:.1f}s of the original audio"
+                )
+
+            # Encoded chunks flow through a bounded queue to a fixed pool of uploaders,
+            # so the first uploads start while later chunks are still being encoded
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers * 2)
+            # Filled by chunk index, so results come out in order whatever order they complete in
+            transcriptions: List[Optional[str]] = [None] * len(boundaries)
+
+            async def produce_chunks() -> None:
+                for i, (start, end) in enumerate(boundaries):
+                    # Encoding is blocking, keep it off the event loop
+                    audio_file = await asyncio.to_thread(self.encode_chunk, full_audio[start:end], i)
+                    await queue.put((i, audio_file))
+                for _ in range(self.max_workers):
+                    await queue.put(None)
+
+            async def consume_chunks(pbar: tqdm) -> None:
+                while (item := await queue.get()) is not None:
+                    chunk_idx, audio_file = item
+                    try:
+                        transcription = await self.process_chunk(audio_file, chunk_idx)
+                    except Exception as e:
+                        logger.error(f"Chunk {chunk_idx} failed: {str(e)}")
+                        raise
+                    transcriptions[chunk_idx] = transcription
+                    pbar.update(1)
+
+            with tqdm(total=len(boundaries), desc="Transcribing") as pbar:
+                # A failing task cancels the others
+                try:
+                    async with asyncio.TaskGroup() as task_group:
+                        task_group.create_task(produce_chunks())
+                        for _ in range(self.max_workers):
+                            task_group.create_task(consume_chunks(pbar))
+                except ExceptionGroup as eg:
+                    # Surface the chunk's own error instead of the group wrapping it
+                    raise eg.exceptions[0]
+
+            full_transcription = "\n".join(transcriptions)
             
             # Save the result
             with open(output_filepath, 'w', encoding='utf-8') as file:
                 file.write(full_transcription)
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            with open(cached_transcription_filepath, 'w', encoding='utf-8') as file:
+                file.write(full_transcription)
             
             logger.info(f"Transcription completed and saved to: {output_filepath}")
             return str(output_filepath)
@@ -234,8 +603,11 @@ def main():
         If there's an error during the transcription process
     """
     try:
-        transcriber = AudioTranscriber()
-        transcriber.transcribe_file('CAP 10 to MVP 01.m4a')
+        async def run() -> None:
+            async with AudioTranscriber() as transcriber:
+                await transcriber.transcribe_file('CAP 10 to MVP 01.m4a')
+
+        asyncio.run(run())
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
         raise
@@ -1,47 +1,33 @@
 # %% Import Libs
 
+import asyncio
+import logging
 import os
-from src.langchain_utils import get_llm_openai, get_llm_anthropic
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-import os
-
-# Model Name
-DEFAULT_MODEL_NAME = 'gpt-4o'
+from src.env_config import get_env
+from src.llm_cache import SemanticCache
+from src.recaps import run_recap
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
 
 # Paths
 PATH = 'data/'
 OUTPUT_PATH = os.path.join(PATH, 'output')
 
-INPUT_FILENAME = 'Entendimiento ISO 27001 RSM - CCS.txt'
-INPUT_FILEPATH = os.path.join(OUTPUT_PATH, INPUT_FILENAME)
-
-OUTPUT_FILENAME = os.path.splitext(INPUT_FILENAME)[0] + ".md"
-OUTPUT_FILEPATH = os.path.join(OUTPUT_PATH, OUTPUT_FILENAME)
-
-# %% Functions
-
-def read_transcript_file(filepath):
-    """
-    Reads the content of a transcript file and returns it as a string.
-    
-    Args:
-    - filepath (str): The path to the transcript file.
-    
-    Returns:
-    - str: The content of the file.
-    """
-    with open(filepath, 'r', encoding='utf-8') as file:
-        content = file.read()
-    return content
-
-meeting_transcript = read_transcript_file(INPUT_FILEPATH)
+RECAP_INPUT_FILENAME = 'Entendimiento ISO 27001 RSM - CCS.txt'
+RECAP_INPUT_FILEPATH = os.path.join(OUTPUT_PATH, RECAP_INPUT_FILENAME)
+RECAP_OUTPUT_FILEPATH = os.path.join(OUTPUT_PATH, os.path.splitext(RECAP_INPUT_FILENAME)[0] + ".md")
 
+USE_CASES_INPUT_FILENAME = 'Data room analysis using AI.txt'
+USE_CASES_INPUT_FILEPATH = os.path.join(OUTPUT_PATH, USE_CASES_INPUT_FILENAME)
+USE_CASES_OUTPUT_FILEPATH = os.path.join(OUTPUT_PATH, os.path.splitext(USE_CASES_INPUT_FILENAME)[0] + ".md")
 
-# Setup the Model based on the selected model name
-model = get_llm_openai(DEFAULT_MODEL_NAME, max_tokens=4096, temperature=0.1)
+# %% Prompts
 
-prompt = ChatPromptTemplate.from_template("""### Meeting Summarizer AI Prompt
+RECAP_TEMPLATE = """### Meeting Summarizer AI Prompt
 
 You are a Meeting Summarizer AI that specializes in processing automatically generated meeting transcripts, such as those from MS Teams or Zoom, to extract key information and provide detailed recaps.
 
@@ -76,18 +62,56 @@ Identify and list out the specific next steps that were discussed or decided upo
 End with a conclusion section that summarizes the main outcomes and key takeaways from the meeting.
 
 Your goal is to provide a comprehensive yet concise overview of the meeting that focuses on capturing the essential information, decisions made, action items assigned, and any important considerations.
-""")
+"""
 
-chain = prompt | model | StrOutputParser()
+USE_CASES_TEMPLATE = """You are a Meeting Summarizer AI that specializes in processing automatically generated meeting transcripts, such as those from MS Teams or Zoom, to extract key information and potential automation use cases.
 
-response = chain.invoke(
-    {
-        "MEETING_TRANSCRIPT": meeting_transcript,
-        }
-)
+Here is the transcript from the meeting about possible use cases to automate for the company:
+
+<meeting_transcript>
+{MEETING_TRANSCRIPT}
+</meeting_transcript>
+
+Please read through the entire meeting transcript carefully. Once you have finished processing the transcript, provide the following:
+
+1. Write a concise summary of the key points, decisions, and takeaways from the meeting. 
+
+2. Create a meeting recap highlighting the main topics that were discussed and any action items that were assigned.
+
+3. List out all the potential use cases for automation that were mentioned during the meeting. For each use case, provide the following details:
+- Use case: A brief name for the use case 
+- Summary: A 1-2 sentence description of the use case
+- Implementation: High-level thoughts on how this could be automated
+- Data needed: What data would be required to automate this
+- Complexity: An estimate of how complex it would be to automate (Simple, Moderate, Complex) 
+- Additional info: Any other relevant notes about the use case
+
+4. Identify and list out the specific next steps that were discussed or decided upon during the meeting.
+
+5. End with a conclusion section that summarizes the main outcomes and key takeaways from the meeting.
+
+Please structure your output exactly as specified above, with clear headings for each section. The use case details should follow the explicit format provided.
+
+Your goal is to provide a comprehensive yet concise overview of the meeting that focuses on capturing the essential information, potential automation opportunities, and next steps.
+"""
+
+# %% Run
+
+async def main():
+    """
+    Generates the meeting recap and the use cases recap concurrently.
+    """
+    cache = None
+    if not get_env().llm_cache_disable:
+        # Reuse the recaps of near-identical transcripts
+        cache = SemanticCache()
 
-with open(OUTPUT_FILEPATH, 'w') as file:
-    file.write(response)
-print(f"Meeting report saved to {OUTPUT_FILEPATH}")
+    # Both LLM calls are independent and IO-bound, so they run side by side
+    await asyncio.gather(
+        run_recap(RECAP_TEMPLATE, RECAP_INPUT_FILEPATH, RECAP_OUTPUT_FILEPATH, cache),
+        run_recap(USE_CASES_TEMPLATE, USE_CASES_INPUT_FILEPATH, USE_CASES_OUTPUT_FILEPATH, cache),
+    )
 
 
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""
+Module for generating meeting recaps from transcripts with an LLM.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import List, Optional
+
+import tiktoken
+from langchain.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+from src.exact_cache import get_cache_key, get_cached_response, put_cached_response
+from src.langchain_utils import get_llm_openai
+from src.llm_cache import SemanticCache
+
+# Model Name
+DEFAULT_MODEL_NAME = 'gpt-4o'
+# Deterministic sampling so identical requests can be served from the cache
+TEMPERATURE = 0.0
+MAX_TOKENS = 4096
+
+# Long transcripts are first condensed section by section with a smaller model
+MAP_MODEL_NAME = 'gpt-4o-mini'
+MAP_MAX_TOKENS = 2048
+MAP_MAX_CONCURRENCY = 8
+SECTION_MAX_TOKENS = 8000
+
+MAP_TEMPLATE = """You are processing one section of a longer, automatically generated meeting transcript, such as those from MS Teams or Zoom.
+
+Here is the section of the transcript:
+
+<transcript_section>
+{CHUNK}
+</transcript_section>
+
+Write detailed notes of this section. Keep every topic discussed, decision made, action item assigned (with who is responsible and any deadline), next step, potential use case, consideration, risk and open question, along with the names of the people involved. Do not add anything that is not in the section, and do not write an introduction or a conclusion.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def read_transcript_file(filepath):
+    """
+    Reads the content of a transcript file and returns it as a string.
+    
+    Args:
+    - filepath (str): The path to the transcript file.
+    
+    Returns:
+    - str: The content of the file.
+    """
+    with open(filepath, 'r', encoding='utf-8') as file:
+        content = file.read()
+    return content
+
+
+def chunk_transcript(text: str, max_tokens: int = SECTION_MAX_TOKENS) -> List[str]:
+    """
+    Splits a transcript into sections of at most max_tokens tokens.
+
+    Sections are cut at line breaks, and a line longer than max_tokens is cut
+    at token boundaries.
+
+    Args:
+    - text (str): The transcript to split.
+    - max_tokens (int, optional): The maximum number of tokens of a section. Defaults to 8000.
+
+    Returns:
+    - List[str]: The sections of the transcript.
+    """
+    encoding = tiktoken.get_encoding("cl100k_base")
+
+    sections = []
+    current_lines = []
+    current_tokens = 0
+    for line in text.splitlines(keepends=True):
+        tokens = encoding.encode(line)
+        if current_lines and current_tokens + len(tokens) > max_tokens:
+            sections.append("".join(current_lines))
+            current_lines, current_tokens = [], 0
+
+        if len(tokens) > max_tokens:
+            sections.extend(
+                encoding.decode(tokens[i:i + max_tokens])
+                for i in range(0, len(tokens), max_tokens)
+            )
+            continue
+
+        current_lines.append(line)
+        current_tokens += len(tokens)
+
+    if current_lines:
+        sections.append("".join(current_lines))
+
+    return sections
+
+
+async def summarize_sections(sections: List[str]) -> str:
+    """
+    Condenses each section of a transcript into notes, concurrently.
+
+    Args:
+    - sections (List[str]): The sections of the transcript.
+
+    Returns:
+    - str: The notes of every section, in transcript order.
+    """
+    # Section prompts share a template and vocabulary, so an approximate match from the
+    # global semantic cache could swap in another section's notes; only exact keys are trusted
+    map_model = get_llm_openai(MAP_MODEL_NAME, max_tokens=MAP_MAX_TOKENS, temperature=TEMPERATURE, cache=False)
+    map_chain = ChatPromptTemplate.from_template(MAP_TEMPLATE) | map_model | StrOutputParser()
+
+    partials = await map_chain.abatch(
+        [{"CHUNK": section} for section in sections],
+        config={"max_concurrency": MAP_MAX_CONCURRENCY}
+    )
+
+    return "\n\n".join(
+        f"Notes of part {i} of {len(partials)}:\n{partial}"
+        for i, partial in enumerate(partials, start=1)
+    )
+
+
+async def run_recap(template_str: str, input_path: str, output_path: str, cache: Optional[SemanticCache] = None) -> str:
+    """
+    Generates a recap of a meeting transcript and saves it to a file.
+
+    Transcripts longer than SECTION_MAX_TOKENS are split into sections that are
+    condensed concurrently, and the recap is written from those notes.
+
+    Args:
+    - template_str (str): The prompt template, with a {MEETING_TRANSCRIPT} placeholder.
+    - input_path (str): The path to the transcript file.
+    - output_path (str): The path where the recap is saved.
+    - cache (SemanticCache, optional): The semantic cache to use. When None, no cache is used.
+
+    Returns:
+    - str: The generated recap.
+    """
+    meeting_transcript = read_transcript_file(input_path)
+
+    # Setup the Model based on the selected model name
+    model = get_llm_openai(DEFAULT_MODEL_NAME, max_tokens=MAX_TOKENS, temperature=TEMPERATURE)
+    prompt = ChatPromptTemplate.from_template(template_str)
+    chain = prompt | model | StrOutputParser()
+
+    # Condensed recaps also depend on how the sections are built and summarized. The
+    # settings are always keyed so a cache hit never needs to tokenize the transcript
+    map_settings = {
+        "map_model": MAP_MODEL_NAME,
+        "map_template": MAP_TEMPLATE,
+        "map_max_tokens": MAP_MAX_TOKENS,
+        "section_max_tokens": SECTION_MAX_TOKENS,
+    }
+
+    rendered_prompt = prompt.format(MEETING_TRANSCRIPT=meeting_transcript)
+    cache_key = get_cache_key(DEFAULT_MODEL_NAME, rendered_prompt, TEMPERATURE, MAX_TOKENS, map_settings)
+    # Semantic matches are only looked for among responses of the same model and template
+    cache_namespace = f"{DEFAULT_MODEL_NAME}:{hashlib.sha256(template_str.encode('utf-8')).hexdigest()}"
+    response = None
+
+    if cache is not None:
+        # Identical requests are a single file lookup, similar ones need an embedding call
+        response = get_cached_response(cache_key)
+        if response is None:
+            response = await asyncio.to_thread(cache.get, rendered_prompt, cache_namespace)
+
+    # Write UTF-8 bytes directly, bypassing the text encoder and the platform default encoding
+    if response is not None:
+        with open(output_path, 'wb') as file:
+            file.write(response.encode('utf-8'))
+    else:
+        # The cache keys above stay on the full transcript, so reruns skip the map step too
+        sections = chunk_transcript(meeting_transcript)
+        if len(sections) > 1:
+            logger.info(f"Condensing {len(sections)} transcript sections from {input_path}")
+            meeting_transcript = await summarize_sections(sections)
+
+        # Stream tokens to the file as they arrive so progress is visible while the model generates
+        parts = []
+        with open(output_path, 'wb') as file:
+            async for chunk in chain.astream(
+                {
+                    "MEETING_TRANSCRIPT": meeting_transcript,
+                    }
+            ):
+                file.write(chunk.encode('utf-8'))
+                file.flush()
+                parts.append(chunk)
+        response = "".join(parts)
+
+        if cache is not None:
+            put_cached_response(cache_key, response)
+            await asyncio.to_thread(cache.put, rendered_prompt, cache_namespace, response)
+
+    logger.info(f"Meeting report saved to {output_path}")
+
+    return response